@@ -16,6 +16,23 @@ import re
 import sys
 from pathlib import Path
 
+# Match #[allow(...)] and #[expect(...)] with their contents
+# Also matches #![allow(...)] and #![expect(...)] (crate-level)
+SUPPRESSION_PATTERN = re.compile(r"#!?\[(allow|expect)\s*\(([^)]+)\)\]")
+
+# Lint configuration section headers in Cargo.toml, matched in a single pass
+LINT_SECTION_PATTERN = re.compile(
+    r"^\s*\[(lints(?:\.rust|\.clippy)?|workspace\.lints[^\]]*)\]", re.MULTILINE
+)
+
+# Reported name for each lint section (in reporting order)
+LINT_SECTION_NAMES = {
+    "lints": "[lints] section",
+    "lints.rust": "[lints.rust] section",
+    "lints.clippy": "[lints.clippy] section",
+    "workspace.lints": "[workspace.lints] section",
+}
+
 
 def get_content(tool_input: dict, tool_name: str) -> str | None:
     """Extract content from tool input based on tool type."""
@@ -36,34 +53,27 @@ def find_suppression_patterns(content: str) -> list[tuple[str, str]]:
 
     Returns list of (pattern_type, lint_name) tuples.
     """
-    # Match #[allow(...)] and #[expect(...)] with their contents
-    # Also matches #![allow(...)] and #![expect(...)] (crate-level)
-    pattern = r"#!?\[(allow|expect)\s*\(([^)]+)\)\]"
-    matches = re.findall(pattern, content)
-    return matches
+    # Cheap substring check first, most content has no suppressions at all
+    if "allow" not in content and "expect" not in content:
+        return []
+
+    return SUPPRESSION_PATTERN.findall(content)
 
 
 def find_clippy_config_in_cargo(content: str) -> list[str]:
     """Find clippy/lint configuration in Cargo.toml content."""
-    issues = []
-
-    # Check for [lints] section
-    if re.search(r"^\s*\[lints\]", content, re.MULTILINE):
-        issues.append("[lints] section")
-
-    # Check for [lints.rust] section
-    if re.search(r"^\s*\[lints\.rust\]", content, re.MULTILINE):
-        issues.append("[lints.rust] section")
-
-    # Check for [lints.clippy] section
-    if re.search(r"^\s*\[lints\.clippy\]", content, re.MULTILINE):
-        issues.append("[lints.clippy] section")
+    # Cheap substring check first, most Cargo.toml files have no lint sections
+    if "[lints" not in content and "[workspace.lints" not in content:
+        return []
 
-    # Check for workspace.lints
-    if re.search(r"^\s*\[workspace\.lints", content, re.MULTILINE):
-        issues.append("[workspace.lints] section")
+    found = set()
+    for section in LINT_SECTION_PATTERN.findall(content):
+        # All [workspace.lints...] variants are reported as one section
+        if section.startswith("workspace.lints"):
+            section = "workspace.lints"
+        found.add(section)
 
-    return issues
+    return [name for section, name in LINT_SECTION_NAMES.items() if section in found]
 
 
 def create_block_message(reason: str, guidance: str) -> str:
@@ -150,7 +160,7 @@ def main():
         if suppressions:
             # Format the found suppressions for the message
             found_items = [f"#[{typ}({lint})]" for typ, lint in suppressions]
-            unique_items = list(set(found_items))
+            unique_items = list(dict.fromkeys(found_items))
 
             message = create_block_message(
                 f"Code contains warning suppressions: {', '.join(unique_items)}",
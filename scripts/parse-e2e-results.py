@@ -27,22 +27,45 @@ Exit codes:
   2 = timeout or parse error
 """
 
+import importlib.util
 import json
 import os
 import re
+import selectors
 import signal
 import subprocess
 import sys
 import threading
-import time
 from dataclasses import dataclass
 from dataclasses import field as dataclass_field
 from enum import Enum
+from pathlib import Path
 from typing import Optional
 
+# The ANSI escape patterns are shared with the dev REPL. Load the module by
+# path so the lona_dev_repl package (and its MCP dependencies) is not imported.
+_ANSI_PATH = Path(__file__).resolve().parent.parent / "tools/lona_dev_repl/_ansi.py"
+_ansi_spec = importlib.util.spec_from_file_location("_ansi", _ANSI_PATH)
+assert _ansi_spec is not None and _ansi_spec.loader is not None
+_ansi = importlib.util.module_from_spec(_ansi_spec)
+_ansi_spec.loader.exec_module(_ansi)
+ANSI_RE_STR = _ansi.ANSI_RE_STR
+
 # Test timeout in seconds
 TEST_TIMEOUT = 30
 
+# Bytes read from the QEMU output pipe at once
+READ_SIZE = 64 * 1024
+
+# Prefix of the self-contained JSON line emitted for each spec test result
+_SPEC_MARKER = '{"source_file":'
+
+# Format: [TEST] test_name ... PASS|FAIL|SKIP
+_TEST_RE = re.compile(r"\[TEST\]\s+(\S+)\s+\.\.\.\s+(PASS|FAIL|SKIP)")
+
+# Format: === E2E_VERDICT: PASS|FAIL|TIMEOUT ===
+_VERDICT_RE = re.compile(r"E2E_VERDICT:\s*(PASS|FAIL|TIMEOUT)")
+
 
 class TestStatus(Enum):
     PASS = "PASS"
@@ -54,7 +77,15 @@ class TestStatus(Enum):
 class TestResult:
     name: str
     status: TestStatus
-    details: Optional[str] = None
+    details: list[str] = dataclass_field(default_factory=list)
+
+
+@dataclass
+class VerdictSlot:
+    """Verdict handed from the output reader thread to the main thread."""
+
+    value: Optional[str] = None
+    event: threading.Event = dataclass_field(default_factory=threading.Event)
 
 
 @dataclass
@@ -78,19 +109,19 @@ class SetupError:
     source_line: int
 
 
-def parse_spec_results(output: str) -> tuple[list[SpecResult], list[SetupError]]:
-    """Parse spec test JSON lines from output.
+def parse_spec_results(lines: list[str]) -> tuple[list[SpecResult], list[SetupError]]:
+    """Parse spec test JSON lines collected from the output.
 
     Returns (results, setup_errors) where setup_errors are blocks that failed setup.
     """
     results = []
     setup_errors = []
-    for line in output.split("\n"):
+    for line in lines:
         # Look for JSON lines with source_file (self-contained output)
-        if '{"source_file":' in line:
+        if _SPEC_MARKER in line:
             try:
                 # Extract just the JSON part
-                start = line.find('{"source_file":')
+                start = line.find(_SPEC_MARKER)
                 end = line.rfind("}") + 1
                 if start >= 0 and end > start:
                     data = json.loads(line[start:end])
@@ -260,54 +291,6 @@ def print_spec_summary(
     return (total_passed, total_failed, total_todo_pass, total_todo_fail)
 
 
-def parse_test_output(output: str) -> tuple[list[TestResult], Optional[str]]:
-    """
-    Parse E2E test output and return (results, verdict).
-
-    Returns:
-        Tuple of (list of TestResult, verdict string or None)
-    """
-    results: list[TestResult] = []
-    verdict: Optional[str] = None
-
-    lines = output.split("\n")
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-
-        # Parse individual test results
-        # Format: [TEST] test_name ... PASS|FAIL|SKIP
-        test_match = re.match(r"\[TEST\]\s+(\S+)\s+\.\.\.\s+(PASS|FAIL|SKIP)", line)
-        if test_match:
-            name = test_match.group(1)
-            status = TestStatus(test_match.group(2))
-            details = None
-
-            # Look for details on following lines (indented with spaces)
-            i += 1
-            detail_lines = []
-            while i < len(lines) and lines[i].startswith("  "):
-                detail_lines.append(lines[i].strip())
-                i += 1
-
-            if detail_lines:
-                details = "\n".join(detail_lines)
-
-            results.append(TestResult(name=name, status=status, details=details))
-            continue
-
-        # Parse verdict
-        # Format: === E2E_VERDICT: PASS|FAIL|TIMEOUT ===
-        verdict_match = re.search(r"E2E_VERDICT:\s*(PASS|FAIL|TIMEOUT)", line)
-        if verdict_match:
-            verdict = verdict_match.group(1)
-
-        i += 1
-
-    return results, verdict
-
-
 def print_summary(arch: str, results: list[TestResult], verdict: Optional[str]) -> bool:
     """
     Print compact test summary and return success status.
@@ -345,13 +328,11 @@ def print_summary(arch: str, results: list[TestResult], verdict: Optional[str])
     failed = 0
     skipped = 0
 
+    result_lines: list[str] = []
     for result in results:
         icon = icons[result.status]
-        print(f"  {icon} {result.name}", file=sys.stderr)
-
-        if result.details:
-            for detail_line in result.details.split("\n"):
-                print(f"      {detail_line}", file=sys.stderr)
+        result_lines.append(f"  {icon} {result.name}\n")
+        result_lines.extend(f"      {detail_line}\n" for detail_line in result.details)
 
         if result.status == TestStatus.PASS:
             passed += 1
@@ -360,6 +341,8 @@ def print_summary(arch: str, results: list[TestResult], verdict: Optional[str])
         else:
             skipped += 1
 
+    sys.stderr.writelines(result_lines)
+
     # Print summary
     print(file=sys.stderr)
     print(
@@ -410,68 +393,130 @@ def kill_process_tree(proc: subprocess.Popen) -> None:
         pass
 
 
-def run_qemu_with_monitor(command: list[str]) -> tuple[str, Optional[str]]:
+def run_qemu_with_monitor(
+    command: list[str],
+) -> tuple[Optional[str], list[TestResult], list[str]]:
     """
     Run QEMU, stream output in real-time, and monitor for test completion.
 
+    Test results and the verdict are parsed incrementally as lines arrive,
+    and only spec result JSON lines are kept, so memory stays bounded by
+    the number of results rather than the size of the log.
+
     Timeout is TEST_TIMEOUT seconds (30s by default).
 
     Returns:
-        Tuple of (captured output, verdict or None if timeout)
+        Tuple of (verdict or "TIMEOUT", list of TestResult, spec JSON lines)
     """
-    output_lines: list[str] = []
-    verdict_found = threading.Event()
-    timed_out = False
+    verdict = VerdictSlot()
+    stop_reading = threading.Event()
+    results: list[TestResult] = []
+    spec_lines: list[str] = []
 
     # Start process in new process group so we can kill the whole tree
     proc = subprocess.Popen(
         command,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,  # Line buffered
         preexec_fn=os.setsid,  # Create new process group
     )
 
-    # Regex to match ANSI escape sequences (CSI sequences and simple escapes)
-    # This includes: cursor movement, screen clear, colors, etc.
-    ansi_escape_re = re.compile(r"\x1b(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+    # Details of the most recent test (indented lines following it)
+    detail_lines: Optional[list[str]] = None
+
+    def handle_line(line: str) -> bool:
+        """Echo a line to stderr and parse it, returns True on the verdict line."""
+        nonlocal detail_lines
+
+        # Strip ANSI escape sequences for display (most lines have none)
+        clean_line = ANSI_RE_STR.sub("", line) if "\x1b" in line else line
+        # Skip lines that were ONLY escape sequences (became empty after stripping)
+        # but preserve legitimate empty lines
+        had_escapes = line != clean_line
+        if not (had_escapes and not clean_line.strip()):
+            print(clean_line, end="", file=sys.stderr, flush=True)
+
+        # Keep spec result lines for the spec summary
+        if _SPEC_MARKER in line:
+            spec_lines.append(line)
+
+        # Collect details for the preceding test result
+        if detail_lines is not None and line.startswith("  "):
+            detail_lines.append(line.strip())
+            return False
+        detail_lines = None
+
+        # Parse individual test results
+        test_match = _TEST_RE.match(line)
+        if test_match:
+            name = test_match.group(1)
+            status = TestStatus(test_match.group(2))
+            results.append(TestResult(name=name, status=status))
+            detail_lines = results[-1].details
+            return False
+
+        # Check for verdict marker
+        if "E2E_VERDICT:" in line:
+            verdict_match = _VERDICT_RE.search(line)
+            if verdict_match:
+                verdict.value = verdict_match.group(1)
+            verdict.event.set()
+            return True
+
+        return False
+
+    def handle_text(data: bytes) -> bool:
+        """Decode and handle lines, returns True once the verdict is seen."""
+        # Normalize line endings like universal newlines mode would
+        text = data.decode("utf-8", errors="replace")
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        lines = text.split("\n")
+        # All but the last element were terminated by a newline
+        for line in lines[:-1]:
+            if handle_line(line + "\n"):
+                return True
+        return bool(lines[-1]) and handle_line(lines[-1])
 
     def read_output():
-        """Read output line by line, echo to stderr, and check for verdict."""
+        """Read output in chunks, echo to stderr, and parse test results."""
         assert proc.stdout is not None
-        try:
-            for line in proc.stdout:
-                output_lines.append(line)
-
-                # Strip ANSI escape sequences for display
-                clean_line = ansi_escape_re.sub("", line)
-                # Skip lines that were ONLY escape sequences (became empty after stripping)
-                # but preserve legitimate empty lines
-                had_escapes = line != clean_line
-                if not (had_escapes and not clean_line.strip()):
-                    print(clean_line, end="", file=sys.stderr, flush=True)
-
-                # Check for verdict marker
-                if "E2E_VERDICT:" in line:
-                    verdict_found.set()
-                    break
-        except Exception:
-            pass  # Process was killed
+        fd = proc.stdout.fileno()
+        pending = b""
+
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            try:
+                while not stop_reading.is_set():
+                    if not selector.select(timeout=0.2):
+                        continue
+
+                    chunk = os.read(fd, READ_SIZE)
+                    if not chunk:
+                        # EOF, handle a trailing line without newline
+                        if pending:
+                            handle_text(pending)
+                        break
+
+                    # Only handle complete lines, keep the rest for the next chunk
+                    pending += chunk
+                    end = pending.rfind(b"\n") + 1
+                    if end == 0:
+                        continue
+                    complete, pending = pending[:end], pending[end:]
+                    if handle_text(complete):
+                        break
+            except Exception:
+                pass  # Process was killed
 
     # Start reader thread
     reader = threading.Thread(target=read_output, daemon=True)
     reader.start()
 
     # Wait for verdict or timeout
-    start_time = time.time()
-    while not verdict_found.is_set():
-        elapsed = time.time() - start_time
-        if elapsed > TEST_TIMEOUT:
-            timed_out = True
-            print(f"\n[TIMEOUT] Test exceeded {TEST_TIMEOUT}s limit", file=sys.stderr)
-            break
-        time.sleep(0.1)
+    timed_out = not verdict.event.wait(timeout=TEST_TIMEOUT)
+    if timed_out:
+        print(f"\n[TIMEOUT] Test exceeded {TEST_TIMEOUT}s limit", file=sys.stderr)
+    stop_reading.set()
 
     # Kill QEMU and docker container
     kill_process_tree(proc)
@@ -479,16 +524,11 @@ def run_qemu_with_monitor(command: list[str]) -> tuple[str, Optional[str]]:
     # Wait for reader to finish
     reader.join(timeout=1)
 
-    output = "".join(output_lines)
-
     if timed_out:
-        return output, "TIMEOUT"
-    elif verdict_found.is_set():
-        # Parse verdict from output
-        match = re.search(r"E2E_VERDICT:\s*(PASS|FAIL)", output)
-        return output, match.group(1) if match else None
+        return "TIMEOUT", results, spec_lines
     else:
-        return output, "TIMEOUT"
+        # Verdict was already captured by the reader
+        return verdict.value, results, spec_lines
 
 
 def main():
@@ -505,7 +545,7 @@ def main():
     print("-" * 60, file=sys.stderr)
 
     # Run QEMU and monitor output (streams to stderr in real-time)
-    output, verdict = run_qemu_with_monitor(qemu_command)
+    verdict, results, spec_lines = run_qemu_with_monitor(qemu_command)
 
     # On timeout, don't print summaries - the data is incomplete and misleading
     if verdict == "TIMEOUT":
@@ -515,17 +555,11 @@ def main():
         )
         sys.exit(2)
 
-    # Parse results from captured output
-    results, parsed_verdict = parse_test_output(output)
-
     # Parse spec test results (self-contained, no external JSON needed)
-    spec_results, setup_errors = parse_spec_results(output)
-
-    # Use parsed verdict if available, otherwise use monitor verdict
-    final_verdict = parsed_verdict or verdict
+    spec_results, setup_errors = parse_spec_results(spec_lines)
 
     # Print compact summary for e2e tests
-    e2e_success = print_summary(arch, results, final_verdict)
+    e2e_success = print_summary(arch, results, verdict)
 
     # Print spec test summary
     spec_passed, spec_failed, spec_todo_pass, spec_todo_fail = print_spec_summary(
@@ -0,0 +1,19 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright 2026 Tobias Sarnowski
+
+"""
+ANSI escape sequence patterns.
+
+Shared by the REPL process manager and scripts/parse-e2e-results.py. This
+module must not import anything outside the standard library, as the E2E
+script loads it directly without the MCP dependencies of this package.
+"""
+
+import re
+
+# OSC sequences (terminated by BEL), character set selection, CSI sequences
+# (cursor movement, screen clear, colors, etc.) and simple two-byte escapes
+_ANSI_PATTERN = r"\x1b(?:\].*?\x07|[()][AB012]|\[[0-?]*[ -/]*[@-~]|[@-Z\\-_])"
+
+ANSI_RE_STR = re.compile(_ANSI_PATTERN)
+ANSI_RE_BYTES = re.compile(_ANSI_PATTERN.encode("ascii"))
@@ -9,20 +9,22 @@ architectures running in parallel with independent idle timeouts.
 """
 
 import asyncio
-import atexit
 import os
 import pty
 import re
 import signal
-import subprocess
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
+from ._ansi import ANSI_RE_BYTES
 
 # Prompt patterns
-PROMPT_PATTERN = re.compile(r"lona> $")
+PROMPT_PATTERN = re.compile(rb"lona> $")
+
+# Bytes at the end of the output that are kept for prompt detection
+PROMPT_TAIL_SIZE = 16
 
 # Timeouts
 BOOT_TIMEOUT = 120  # seconds to wait for QEMU to boot
@@ -30,17 +32,19 @@ EVAL_TIMEOUT = 30  # seconds to wait for evaluation
 IDLE_TIMEOUT = 60  # seconds before killing idle QEMU
 IDLE_CHECK_INTERVAL = 10  # seconds between idle checks
 
-# ANSI escape code pattern for cleaning output
-ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]|\x1b\].*?\x07|\x1b[()][AB012]")
-
 
-def clean_output(text: str) -> str:
-    """Remove ANSI escape codes and normalize line endings."""
-    text = ANSI_ESCAPE.sub("", text)
+def clean_output(data: bytes) -> str:
+    """Remove ANSI escape codes, decode, and normalize line endings."""
+    text = ANSI_RE_BYTES.sub(b"", data).decode("utf-8", errors="replace")
     text = text.replace("\r\n", "\n").replace("\r", "\n")
     return text
 
 
+def has_prompt(tail: bytes) -> bool:
+    """Check for the prompt at the end of the output tail."""
+    return PROMPT_PATTERN.search(tail) is not None
+
+
 def find_project_root() -> Path:
     """Find the project root directory (where Makefile is)."""
     current = Path(__file__).resolve().parent
@@ -55,12 +59,55 @@ def find_project_root() -> Path:
 class ProcessState:
     """State for a single architecture's QEMU process."""
 
-    process: subprocess.Popen | None = None
+    process: asyncio.subprocess.Process | None = None
     master_fd: int | None = None
+    transport: asyncio.BaseTransport | None = None
     start_time: datetime | None = None
     last_activity: float = field(default_factory=time.time)
     lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-    output_buffer: str = ""
+    output_buffer: bytearray = field(default_factory=bytearray)
+    output_tail: bytes = b""
+    prompt_event: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether the process is running and its PTY is still open."""
+        return (
+            self.process is not None
+            and self.process.returncode is None
+            and self.master_fd is not None
+        )
+
+
+class PtyProtocol(asyncio.Protocol):
+    """Collects PTY output and signals when the REPL prompt appears."""
+
+    def __init__(self, state: ProcessState) -> None:
+        self._state = state
+        self._transport: asyncio.BaseTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport
+        self._state.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        state = self._state
+        state.output_buffer.extend(data)
+        tail = state.output_tail + data[-PROMPT_TAIL_SIZE:]
+        state.output_tail = tail[-PROMPT_TAIL_SIZE:]
+        if has_prompt(state.output_tail):
+            state.prompt_event.set()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        state = self._state
+        # The transport has closed the PTY master, so drop the fd alias unless
+        # the state already belongs to a newer process
+        if state.transport is self._transport:
+            state.master_fd = None
+            state.transport = None
+        # Process side of the PTY closed; wake up any waiter so it can
+        # report the failure
+        state.prompt_event.set()
 
 
 class ProcessManager:
@@ -72,9 +119,6 @@ class ProcessManager:
         self._idle_task: asyncio.Task | None = None
         self._shutdown = False
 
-        # Register cleanup on exit
-        atexit.register(self._sync_cleanup)
-
     def _get_state(self, arch: str) -> ProcessState:
         """Get or create state for an architecture."""
         if arch not in self._states:
@@ -86,11 +130,14 @@ class ProcessManager:
         state = self._get_state(arch)
 
         async with state.lock:
-            if state.process is not None and state.process.poll() is None:
+            if state.is_alive:
                 # Already running
                 state.last_activity = time.time()
                 return
 
+            # Clean up a process whose PTY closed but which was not reaped yet
+            await self._kill_process(state)
+
             # Start new process
             await self._start_process(arch, state)
 
@@ -104,8 +151,9 @@ class ProcessManager:
         master_fd, slave_fd = pty.openpty()
 
         # Start make run-$ARCH
-        process = subprocess.Popen(
-            ["make", f"run-{arch}"],
+        process = await asyncio.create_subprocess_exec(
+            "make",
+            f"run-{arch}",
             stdin=slave_fd,
             stdout=slave_fd,
             stderr=slave_fd,
@@ -116,41 +164,38 @@ class ProcessManager:
         # Close slave fd in parent
         os.close(slave_fd)
 
-        # Set master to non-blocking
-        os.set_blocking(master_fd, False)
-
         state.process = process
         state.master_fd = master_fd
         state.start_time = datetime.now()
         state.last_activity = time.time()
-        state.output_buffer = ""
+        state.output_buffer = bytearray()
+        state.output_tail = b""
+        state.prompt_event = asyncio.Event()
+
+        # Let the event loop deliver PTY output to the protocol, which also
+        # tracks the transport (and with it the lifetime of master_fd)
+        await asyncio.get_running_loop().connect_read_pipe(
+            lambda: PtyProtocol(state), os.fdopen(master_fd, "rb", buffering=0)
+        )
 
         # Wait for boot (first prompt)
         await self._wait_for_prompt(state, timeout=BOOT_TIMEOUT)
 
     async def _wait_for_prompt(self, state: ProcessState, timeout: float) -> str:
         """Wait for the REPL prompt and return accumulated output."""
-        start = time.time()
-
-        while time.time() - start < timeout:
-            if state.process is None or state.process.poll() is not None:
-                raise RuntimeError("Process died while waiting for prompt")
-
-            try:
-                chunk = os.read(state.master_fd, 4096).decode("utf-8", errors="replace")
-                state.output_buffer += chunk
-            except BlockingIOError:
-                pass  # No data available
-
-            # Check for prompt
-            if PROMPT_PATTERN.search(state.output_buffer):
-                output = state.output_buffer
-                state.output_buffer = ""
-                return clean_output(output)
+        try:
+            await asyncio.wait_for(state.prompt_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Timeout waiting for prompt after {timeout}s") from None
 
-            await asyncio.sleep(0.05)
+        state.prompt_event.clear()
+        if not has_prompt(state.output_tail):
+            raise RuntimeError("Process died while waiting for prompt")
 
-        raise TimeoutError(f"Timeout waiting for prompt after {timeout}s")
+        output = state.output_buffer
+        state.output_buffer = bytearray()
+        state.output_tail = b""
+        return clean_output(output)
 
     async def eval(self, arch: str, code: str) -> str:
         """Evaluate code in the REPL for the given architecture."""
@@ -161,6 +206,9 @@ class ProcessManager:
         async with state.lock:
             state.last_activity = time.time()
 
+            if state.master_fd is None:
+                raise RuntimeError("Process died before evaluation")
+
             # Send code
             os.write(state.master_fd, (code + "\n").encode("utf-8"))
 
@@ -170,14 +218,11 @@ class ProcessManager:
             # Filter output to extract just the result
             # The REPL echoes input on the prompt line (e.g., "lona> 42"), and
             # prints the result on its own line. We skip all prompt lines.
-            lines = output.split("\n")
-            result_lines = []
-            for line in lines:
-                stripped = line.strip()
-                # Skip prompt lines (includes echoed input)
-                if stripped == "lona>" or stripped.startswith("lona> "):
-                    continue
-                result_lines.append(line)
+            result_lines = [
+                line
+                for line in output.split("\n")
+                if not (line.startswith("lona> ") or line.rstrip() == "lona>")
+            ]
 
             return "\n".join(result_lines).strip()
 
@@ -203,31 +248,26 @@ class ProcessManager:
         except (ProcessLookupError, OSError):
             pass
 
-        # Wait a bit for graceful shutdown
-        for _ in range(10):
-            if state.process.poll() is not None:
-                break
-            await asyncio.sleep(0.1)
-
-        # Force kill if still running
-        if state.process.poll() is None:
+        # Wait a bit for graceful shutdown, force kill if still running
+        try:
+            await asyncio.wait_for(state.process.wait(), 1.0)
+        except asyncio.TimeoutError:
             try:
                 pgid = os.getpgid(state.process.pid)
                 os.killpg(pgid, signal.SIGKILL)
             except (ProcessLookupError, OSError):
                 pass
 
-        # Close file descriptor
-        if state.master_fd is not None:
-            try:
-                os.close(state.master_fd)
-            except OSError:
-                pass
+        # Closing the transport also closes the PTY master
+        if state.transport is not None:
+            state.transport.close()
 
         state.process = None
         state.master_fd = None
+        state.transport = None
         state.start_time = None
-        state.output_buffer = ""
+        state.output_buffer = bytearray()
+        state.output_tail = b""
 
     async def _idle_monitor(self) -> None:
         """Monitor all processes and kill idle ones."""
@@ -236,7 +276,7 @@ class ProcessManager:
 
             now = time.time()
             for arch, state in list(self._states.items()):
-                if state.process is None or state.process.poll() is not None:
+                if not state.is_alive:
                     continue
 
                 idle_time = now - state.last_activity
@@ -252,7 +292,7 @@ class ProcessManager:
     def is_running(self, arch: str) -> bool:
         """Check if QEMU is running for the given architecture."""
         state = self._get_state(arch)
-        return state.process is not None and state.process.poll() is None
+        return state.is_alive
 
     async def close(self) -> None:
         """Shut down all processes."""
@@ -268,18 +308,3 @@ class ProcessManager:
         for state in self._states.values():
             async with state.lock:
                 await self._kill_process(state)
-
-    def _sync_cleanup(self) -> None:
-        """Synchronous cleanup for atexit."""
-        for state in self._states.values():
-            if state.process is not None and state.process.poll() is None:
-                try:
-                    pgid = os.getpgid(state.process.pid)
-                    os.killpg(pgid, signal.SIGKILL)
-                except (ProcessLookupError, OSError):
-                    pass
-            if state.master_fd is not None:
-                try:
-                    os.close(state.master_fd)
-                except OSError:
-                    pass